@@ -1,101 +1,202 @@
 #!/usr/bin/env python3
+import heapq
 import json
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 
-def load_doaj_results(filename):
-    with open(filename, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data
-
-def categorize_by_era(paper):
-    abstract = paper.get('bibjson', {}).get('abstract', '').lower()
-    keywords = ' '.join(paper.get('bibjson', {}).get('keywords', [])).lower()
-    title = paper.get('bibjson', {}).get('title', '').lower()
-    year = paper.get('bibjson', {}).get('year', '')
-    content = f"{title} {abstract} {keywords}".lower()
-
-    early_indicators = ['wilde', 'aestheticism', 'decadence', 'fin de siècle', 'symbolism', 'pater', 'beardsley', 'symons']
-    high_indicators = ['pound', 'eliot', 'joyce', 'woolf', 'yeats', 'imagism', 'vorticism', 'stream of consciousness', 'waste land', 'ulysses']
-    late_indicators = ['auden', 'spender', 'isherwood', 'macneice', 'thirties', '1930s', 'spanish civil war', 'world war ii']
-
-    early_count = sum(1 for indicator in early_indicators if indicator in content)
-    high_count = sum(1 for indicator in high_indicators if indicator in content)
-    late_count = sum(1 for indicator in late_indicators if indicator in content)
-
-    if early_count > high_count and early_count > late_count:
-        return 'Early Modernism (1890s-1910s)'
-    elif high_count > early_count and high_count > late_count:
-        return 'High Modernism (1910s-1920s)'
-    elif late_count > early_count and late_count > high_count:
-        return 'Late Modernism (1930s-1950s)'
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def read_json(filename):
+    """Parse a JSON file, using orjson when it is installed"""
+    with open(filename, 'rb') as f:
+        if orjson is not None:
+            return orjson.loads(f.read())
+        return json.load(f)
+
+def _json_default(obj):
+    if isinstance(obj, PaperMetadata):
+        return {name: getattr(obj, name) for name in obj.__slots__}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def write_json(data, filename):
+    """Write data as indented UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     else:
-        return 'General Modernism'
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=_json_default)
+
+def _encode_json(data):
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, indent=2, ensure_ascii=False, default=_json_default)
+
+def _write_json_object(f, items, depth):
+    indent = '  ' * (depth + 1)
+    first = True
+    for key, value in items:
+        f.write(('{\n' if first else ',\n') + indent + _encode_json(key) + ': ')
+        first = False
+        if isinstance(value, Iterator):
+            _write_json_object(f, value, depth + 1)
+        else:
+            # Encoded JSON never contains raw newlines inside strings, so this only re-indents
+            f.write(_encode_json(value).replace('\n', '\n' + indent))
+    f.write('{}' if first else '\n' + '  ' * depth + '}')
+
+def write_json_stream(sections, filename):
+    """Write a JSON object one (key, value) section at a time.
+
+    A value that is itself an iterator of (key, value) pairs is written as a
+    nested object in the same way, so only one entry is encoded at any moment.
+    The result is identical to write_json on the equivalent dict.
+    """
+    with open(filename, 'w', encoding='utf-8') as f:
+        _write_json_object(f, sections, 0)
+
+def load_doaj_results(filename):
+    return read_json(filename)
 
-def categorize_by_medium(paper):
-    journal_info = paper.get('bibjson', {}).get('journal', {})
-    journal_title = journal_info.get('title', '').lower()
-    publisher = journal_info.get('publisher', '').lower()
-    content = f"{journal_title} {publisher}"
+ERA_INDICATORS = {
+    'Early Modernism (1890s-1910s)': ['wilde', 'aestheticism', 'decadence', 'fin de siècle', 'symbolism', 'pater', 'beardsley', 'symons'],
+    'High Modernism (1910s-1920s)': ['pound', 'eliot', 'joyce', 'woolf', 'yeats', 'imagism', 'vorticism', 'stream of consciousness', 'waste land', 'ulysses'],
+    'Late Modernism (1930s-1950s)': ['auden', 'spender', 'isherwood', 'macneice', 'thirties', '1930s', 'spanish civil war', 'world war ii'],
+}
+INDICATOR_ERA = {indicator: era for era, indicators in ERA_INDICATORS.items() for indicator in indicators}
+ERA_RE = re.compile(r'\b(?:' + '|'.join(map(re.escape, INDICATOR_ERA)) + r')\b')
 
-    if any(word in content for word in ['journal', 'review', 'studies', 'quarterly', 'university', 'research']):
+@lru_cache(maxsize=4096)
+def _classify_era(title, abstract, keywords):
+    content = f"{title} {abstract} {' '.join(keywords)}".lower()
+
+    # Each indicator counts once per paper, however often it is mentioned
+    counts = Counter(INDICATOR_ERA[indicator] for indicator in set(ERA_RE.findall(content)))
+    if counts:
+        (top_era, top_count), *rest = counts.most_common(2)
+        if not rest or top_count > rest[0][1]:
+            return top_era
+    return 'General Modernism'
+
+def categorize_by_era(metadata):
+    return _classify_era(metadata.title, metadata.abstract, tuple(metadata.keywords))
+
+ACADEMIC_RE = re.compile('journal|review|studies|quarterly|university|research')
+LITERARY_RE = re.compile('magazine|letters|writing|poetry|literature|arts')
+
+@lru_cache(maxsize=4096)
+def _classify_medium(journal_title, publisher):
+    content = f"{journal_title} {publisher}".lower()
+
+    if ACADEMIC_RE.search(content):
         return 'Academic Journal'
-    elif any(word in content for word in ['magazine', 'letters', 'writing', 'poetry', 'literature', 'arts']):
+    elif LITERARY_RE.search(content):
         return 'Literary Magazine'
     else:
         return 'Other Publication'
 
+def categorize_by_medium(metadata):
+    return _classify_medium(metadata.journal, metadata.publisher)
+
+@dataclass(slots=True)
+class PaperMetadata:
+    """Analysis fields for one paper; slotted to keep large corpora compact"""
+    id: str
+    title: str
+    authors: list
+    year: str
+    year_int: int | None
+    journal: str
+    publisher: str
+    country: str
+    keywords: list
+    abstract: str
+    doi: str | None
+    full_text_links: list
+    subjects: list
+    era: str | None = None
+    medium: str | None = None
+
 def extract_metadata_for_analysis(paper):
-    bibjson = paper.get('bibjson', {})
-    return {
-        'id': paper.get('id'),
-        'title': bibjson.get('title', ''),
-        'authors': [author.get('name', '') for author in bibjson.get('author', [])],
-        'year': bibjson.get('year', ''),
-        'journal': bibjson.get('journal', {}).get('title', ''),
-        'publisher': bibjson.get('journal', {}).get('publisher', ''),
-        'country': bibjson.get('journal', {}).get('country', ''),
-        'keywords': bibjson.get('keywords', []),
-        'abstract': bibjson.get('abstract', ''),
-        'doi': next((id['id'] for id in bibjson.get('identifier', []) if id.get('type') == 'doi'), None),
-        'full_text_links': [link['url'] for link in bibjson.get('link', []) if link.get('type') == 'fulltext'],
-        'subjects': [subj.get('term', '') for subj in bibjson.get('subject', [])]
-    }
+    bibjson = paper.get('bibjson') or {}
+    journal = bibjson.get('journal') or {}
+    # Reversed so the first identifier of each type wins
+    identifiers = {identifier.get('type'): identifier.get('id') for identifier in reversed(bibjson.get('identifier') or [])}
+    year = bibjson.get('year', '')
+    return PaperMetadata(
+        id=paper.get('id'),
+        title=bibjson.get('title', ''),
+        authors=[author.get('name', '') for author in bibjson.get('author', [])],
+        year=year,
+        year_int=int(year) if year and str(year).isdigit() else None,
+        journal=journal.get('title', ''),
+        publisher=journal.get('publisher', ''),
+        country=journal.get('country', ''),
+        keywords=bibjson.get('keywords', []),
+        abstract=bibjson.get('abstract', ''),
+        doi=identifiers.get('doi'),
+        full_text_links=[link['url'] for link in bibjson.get('link') or [] if link.get('type') == 'fulltext'],
+        subjects=[subj.get('term', '') for subj in bibjson.get('subject', [])]
+    )
+
+def process_paper(paper):
+    """Extract a paper's metadata and categorize it from the extracted fields"""
+    metadata = extract_metadata_for_analysis(paper)
+    # Classification is memoized on the raw fields, so papers sharing a journal
+    # (or reprinted abstracts) are only lowercased and scanned once
+    return categorize_by_era(metadata), categorize_by_medium(metadata), metadata
+
+def iter_categories(categories, all_metadata):
+    """Yield each category name with the metadata entries its paper indices point at"""
+    for name, indices in categories.items():
+        yield name, [all_metadata[i] for i in indices]
+
+def expand_categories(categories, all_metadata):
+    return dict(iter_categories(categories, all_metadata))
 
 def analyze_doaj_modernism(filename):
     data = load_doaj_results(filename)
     era_categories = defaultdict(list)
     medium_categories = defaultdict(list)
+    journals_by_medium = defaultdict(set)
     all_papers_metadata = []
 
     for paper in data['results']:
-        era = categorize_by_era(paper)
-        medium = categorize_by_medium(paper)
-        metadata = extract_metadata_for_analysis(paper)
+        era, medium, metadata = process_paper(paper)
+        metadata.era = era
+        metadata.medium = medium
 
-        era_categories[era].append(metadata)
-        medium_categories[medium].append(metadata)
-        all_papers_metadata.append({**metadata, 'era': era, 'medium': medium})
+        # Categories hold indices into all_papers_metadata rather than copies of the papers
+        index = len(all_papers_metadata)
+        era_categories[era].append(index)
+        medium_categories[medium].append(index)
+        if journal := metadata.journal:
+            journals_by_medium[medium].add(journal)
+        all_papers_metadata.append(metadata)
 
     print(f"Total papers found: {data['total']}")
     print(f"\n=== BY MODERNIST ERA ===")
-    for era, papers in era_categories.items():
-        print(f"\n{era}: {len(papers)} papers")
-        for paper in papers[:2]:
-            print(f"  • {paper['title'][:60]}... ({paper['year']})")
+    for era, indices in era_categories.items():
+        print(f"\n{era}: {len(indices)} papers")
+        for paper in (all_papers_metadata[i] for i in indices[:2]):
+            print(f"  • {paper.title[:60]}... ({paper.year})")
 
     print(f"\n=== BY PUBLICATION MEDIUM ===")
-    for medium, papers in medium_categories.items():
-        print(f"\n{medium}: {len(papers)} papers")
-        journals = set(paper['journal'] for paper in papers if paper['journal'])
-        for journal in sorted(journals)[:3]:
+    for medium, indices in medium_categories.items():
+        print(f"\n{medium}: {len(indices)} papers")
+        for journal in heapq.nsmallest(3, journals_by_medium[medium]):
             print(f"  - {journal}")
 
     return {'era_categories': dict(era_categories), 'medium_categories': dict(medium_categories), 'all_metadata': all_papers_metadata}
 
 if __name__ == "__main__":
     results = analyze_doaj_modernism('modernism_search.json')
-    with open('british_modernism_analysis.json', 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    write_json(results, 'british_modernism_analysis.json')
     print(f"\nAnalysis saved to 'british_modernism_analysis.json'")
\ No newline at end of file
@@ -1,49 +1,83 @@
 #!/usr/bin/env python3
-import json
+import argparse
 import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from analyze_modernism import PaperMetadata, analyze_doaj_modernism, expand_categories, iter_categories, read_json, write_json, write_json_stream
+
 def load_analysis_results():
-    with open('british_modernism_analysis.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
+    results = read_json('british_modernism_analysis.json')
+    results['all_metadata'] = [PaperMetadata(**paper) for paper in results['all_metadata']]
+    return results
+
+NEWLINE_TABLE = str.maketrans('\n\r', '  ')
+
+CSV_FIELDS = ('id', 'title', 'authors', 'year', 'era', 'journal', 'publisher', 'country', 'medium',
+              'keywords', 'abstract', 'doi', 'full_text_links', 'subjects', 'abstract_length',
+              'has_doi', 'has_full_text', 'keyword_count')
+
+def csv_row(paper):
+    # Values in CSV_FIELDS order
+    return (
+        paper.id,
+        paper.title,
+        '; '.join(paper.authors),
+        paper.year,
+        paper.era,
+        paper.journal,
+        paper.publisher,
+        paper.country,
+        paper.medium,
+        '; '.join(paper.keywords),
+        paper.abstract.translate(NEWLINE_TABLE),
+        paper.doi,
+        '; '.join(paper.full_text_links),
+        '; '.join(paper.subjects),
+        len(paper.abstract),
+        'Yes' if paper.doi else 'No',
+        'Yes' if paper.full_text_links else 'No',
+        len(paper.keywords)
+    )
 
 def create_csv_for_analysis(results):
     """Create CSV format suitable for text analysis tools like R, Python pandas, etc."""
-    csv_data = []
-
-    for paper in results['all_metadata']:
-        row = {
-            'id': paper['id'],
-            'title': paper['title'],
-            'authors': '; '.join(paper['authors']),
-            'year': paper['year'],
-            'era': paper['era'],
-            'journal': paper['journal'],
-            'publisher': paper['publisher'],
-            'country': paper['country'],
-            'medium': paper['medium'],
-            'keywords': '; '.join(paper['keywords']),
-            'abstract': paper['abstract'].replace('\n', ' ').replace('\r', ' '),
-            'doi': paper.get('doi', ''),
-            'full_text_links': '; '.join(paper['full_text_links']),
-            'subjects': '; '.join(paper['subjects']),
-            'abstract_length': len(paper['abstract']),
-            'has_doi': 'Yes' if paper.get('doi') else 'No',
-            'has_full_text': 'Yes' if paper['full_text_links'] else 'No',
-            'keyword_count': len(paper['keywords'])
-        }
-        csv_data.append(row)
-
     with open('british_modernism_for_analysis.csv', 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = csv_data[0].keys()
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(csv_data)
+        writer = csv.writer(csvfile)
+        writer.writerow(CSV_FIELDS)
+        # Rows are built lazily so the whole table never sits in memory
+        writer.writerows(map(csv_row, results['all_metadata']))
 
 def create_structured_output(results):
     """Create comprehensive structured output"""
-    output = {
-        'metadata': {
+    earliest = latest = None
+    countries, journals = set(), set()
+    papers_with_doi = 0
+    all_abstracts, all_keywords, full_text_available = [], [], []
+    for p in results['all_metadata']:
+        all_abstracts.append({'id': p.id, 'title': p.title, 'abstract': p.abstract,
+                              'era': p.era, 'year': p.year})
+        all_keywords.append({'id': p.id, 'title': p.title, 'keywords': p.keywords,
+                             'era': p.era, 'year': p.year})
+        if (year := p.year_int) is not None:
+            if earliest is None or year < earliest:
+                earliest = year
+            if latest is None or year > latest:
+                latest = year
+        if p.country:
+            countries.add(p.country)
+        if p.journal:
+            journals.add(p.journal)
+        if p.full_text_links:
+            full_text_available.append(p)
+        if p.doi:
+            papers_with_doi += 1
+
+    # Sections are encoded one at a time, and the grouped views one category at a
+    # time, so the full document is never built in memory
+    sections = [
+        ('metadata', {
             'extraction_date': datetime.now().isoformat(),
             'total_papers_in_doaj': 84,
             'papers_analyzed': len(results['all_metadata']),
@@ -53,44 +87,45 @@ def create_structured_output(results):
                 'by_era': list(results['era_categories'].keys()),
                 'by_medium': list(results['medium_categories'].keys())
             }
-        },
-        'summary_statistics': {
-            'era_distribution': {era: len(papers) for era, papers in results['era_categories'].items()},
-            'medium_distribution': {medium: len(papers) for medium, papers in results['medium_categories'].items()},
+        }),
+        ('summary_statistics', {
+            'era_distribution': {era: len(indices) for era, indices in results['era_categories'].items()},
+            'medium_distribution': {medium: len(indices) for medium, indices in results['medium_categories'].items()},
             'year_range': {
-                'earliest': min(int(p['year']) for p in results['all_metadata'] if p['year'].isdigit()),
-                'latest': max(int(p['year']) for p in results['all_metadata'] if p['year'].isdigit())
+                'earliest': earliest,
+                'latest': latest
             },
-            'countries_represented': len(set(p['country'] for p in results['all_metadata'] if p['country'])),
-            'journals_represented': len(set(p['journal'] for p in results['all_metadata'] if p['journal'])),
-            'papers_with_full_text': len([p for p in results['all_metadata'] if p['full_text_links']]),
-            'papers_with_doi': len([p for p in results['all_metadata'] if p.get('doi')])
-        },
-        'organized_by_era': results['era_categories'],
-        'organized_by_medium': results['medium_categories'],
-        'text_analysis_ready': {
-            'all_abstracts': [{'id': p['id'], 'title': p['title'], 'abstract': p['abstract'],
-                              'era': p['era'], 'year': p['year']} for p in results['all_metadata']],
-            'all_keywords': [{'id': p['id'], 'title': p['title'], 'keywords': p['keywords'],
-                             'era': p['era'], 'year': p['year']} for p in results['all_metadata']],
-            'full_text_available': [p for p in results['all_metadata'] if p['full_text_links']]
-        }
+            'countries_represented': len(countries),
+            'journals_represented': len(journals),
+            'papers_with_full_text': len(full_text_available),
+            'papers_with_doi': papers_with_doi
+        }),
+        ('organized_by_era', iter_categories(results['era_categories'], results['all_metadata'])),
+        ('organized_by_medium', iter_categories(results['medium_categories'], results['all_metadata'])),
+        ('text_analysis_ready', iter([
+            ('all_abstracts', all_abstracts),
+            ('all_keywords', all_keywords),
+            ('full_text_available', full_text_available)
+        ]))
+    ]
+
+    write_json_stream(sections, 'british_modernism_comprehensive.json')
+
+def write_era_file(era, papers):
+    filename = f"era_{era.lower().replace(' ', '_').replace('(', '').replace(')', '').replace('-', '_')}.json"
+    era_data = {
+        'era': era,
+        'paper_count': len(papers),
+        'papers': papers
     }
-
-    with open('british_modernism_comprehensive.json', 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    write_json(era_data, filename)
 
 def create_era_specific_files(results):
-    """Create separate files for each era"""
-    for era, papers in results['era_categories'].items():
-        filename = f"era_{era.lower().replace(' ', '_').replace('(', '').replace(')', '').replace('-', '_')}.json"
-        era_data = {
-            'era': era,
-            'paper_count': len(papers),
-            'papers': papers
-        }
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(era_data, f, indent=2, ensure_ascii=False)
+    """Create separate files for each era, writing them concurrently"""
+    eras = expand_categories(results['era_categories'], results['all_metadata'])
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        # Consuming the results re-raises any error from a worker
+        list(executor.map(write_era_file, eras.keys(), eras.values()))
 
 def create_readme():
     """Create README explaining the data structure"""
@@ -117,7 +152,7 @@ def create_readme():
 - **Other Publication**: Books, series, and other publication types
 
 ### Metadata Fields:
-- **Bibliographic**: title, authors, year, journal, publisher, country
+- **Bibliographic**: title, authors, year (and numeric year_int), journal, publisher, country
 - **Content**: abstract, keywords, subjects
 - **Access**: DOI, full-text links
 - **Categorization**: era, medium classification
@@ -158,7 +193,19 @@ def create_readme():
         f.write(readme_content)
 
 if __name__ == "__main__":
-    results = load_analysis_results()
+    parser = argparse.ArgumentParser(description="Create analysis-ready formats from the DOAJ search results")
+    parser.add_argument('--write-intermediate', action='store_true',
+                        help="also save the raw analysis to british_modernism_analysis.json")
+    args = parser.parse_args()
+
+    # Analyze in-process rather than round-tripping through the intermediate JSON;
+    # fall back to a previously saved analysis when the DOAJ response is absent
+    if os.path.exists('modernism_search.json'):
+        results = analyze_doaj_modernism('modernism_search.json')
+        if args.write_intermediate:
+            write_json(results, 'british_modernism_analysis.json')
+    else:
+        results = load_analysis_results()
 
     print("Creating analysis-ready formats...")
     create_csv_for_analysis(results)